@@ -10,7 +10,7 @@ Example:
     <data foo="foo" />
 """
 
-from .serde import model_dump_xml, model_validate_xml
+from .serde import model_dump_xml, model_dump_xml_to_stream, model_validate_xml
 from .xmlmodel import BaseModelXML, XMLConfigDict, XMLModel
 
 __all__ = [
@@ -18,5 +18,6 @@ __all__ = [
     "BaseModelXML",
     "XMLConfigDict",
     "model_dump_xml",
+    "model_dump_xml_to_stream",
     "model_validate_xml",
 ]
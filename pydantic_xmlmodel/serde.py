@@ -1,9 +1,18 @@
 """Convertation between pydantic and xml."""
 
+import sys
+from enum import IntEnum
 from logging import getLogger
 from typing import (
+    IO,
     Any,
+    Callable,
     Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
     Optional,
     Sequence,
     Set,
@@ -14,14 +23,98 @@ from typing import (
     get_args,
     get_origin,
 )
-from xml.etree.ElementTree import Element, SubElement, fromstring, tostring
+from xml.etree import ElementTree
+from xml.etree.ElementTree import Element, ParseError, fromstring, iterparse
 
 from pydantic import BaseModel
 
+try:
+    from lxml.etree import LXML_VERSION as _LXML_VERSION
+    from lxml.etree import XMLParser as _LxmlParser
+    from lxml.etree import XMLSyntaxError as _LxmlSyntaxError
+    from lxml.etree import fromstring as _lxml_fromstring
+    from lxml.etree import iterparse as _lxml_iterparse
+
+    # Older versions can't resolve only the internal entities, see `_LXML_OPTIONS`.
+    HAVE_LXML = _LXML_VERSION >= (5,)
+except ImportError:  # pragma: no cover
+    HAVE_LXML = False
+
 _T = TypeVar("_T", bound="BaseModel")
+_V = TypeVar("_V")
+
+_MISSING = object()
+"""Sentinel for values that are missing from the instance `__dict__`."""
 
 logger = getLogger(__name__)
 
+_XML_DECLARATION = '<?xml version="1.0" ?>'
+_XML_DECLARATION_BYTES = _XML_DECLARATION.encode("utf-8")
+
+_ET_NAMESPACE_PREFIXES: Dict[str, str] = getattr(ElementTree, "_namespace_map", {})
+"""The prefixes ElementTree uses for well-known namespaces and for the ones added with `register_namespace`."""
+
+_LXML_OPTIONS: Dict[str, Any] = {
+    # Like the stdlib parser, the entities declared in the document are resolved, but external entities are not
+    # (to avoid fetching external resources, XXE).
+    "resolve_entities": "internal",
+    "no_network": True,
+    # The stdlib parser drops comments and processing instructions, so they don't split the text of an element.
+    "remove_comments": True,
+    "remove_pis": True,
+    # The stdlib parser doesn't limit the size of text nodes, so neither does lxml. lxml still limits the nesting
+    # depth to 2048 elements and protects against entity expansion attacks.
+    "huge_tree": True,
+}
+"""Options of the lxml parser, chosen so that it loads the same data as the stdlib parser."""
+
+if HAVE_LXML:
+    _lxml_parser = _LxmlParser(**_LXML_OPTIONS)
+
+
+def _to_parse_error(error: "_LxmlSyntaxError") -> ParseError:
+    """Convert an lxml syntax error to the `ParseError` raised by the stdlib parser.
+
+    Note that the `code` of the error is the libxml2 error code, not an expat one.
+    """
+    parse_error = ParseError(str(error))
+    parse_error.code = error.code
+    parse_error.position = error.position
+    return parse_error
+
+
+def _parse_xml(source: Union[str, bytes]) -> Element:
+    """Parse an XML string or bytes into an element.
+
+    lxml is used when it's installed, because its parser is considerably faster than the stdlib one. Syntax errors
+    are always raised as `xml.etree.ElementTree.ParseError`, no matter which parser is used.
+    """
+    if not HAVE_LXML:
+        return fromstring(source)
+    try:
+        return _lxml_fromstring(source, _lxml_parser)
+    except _LxmlSyntaxError as e:
+        raise _to_parse_error(e) from e
+    except ValueError:
+        if not isinstance(source, str):
+            raise
+        # lxml refuses unicode strings with an encoding declaration, the stdlib parser accepts them.
+        return fromstring(source)
+
+
+def _iterparse(source: IO[bytes]) -> Iterator[Tuple[str, Element]]:
+    """Parse a binary XML stream incrementally, yielding the start and end events of its elements.
+
+    Like `_parse_xml`, lxml is used when it's installed and its syntax errors are raised as `ParseError`.
+    """
+    if not HAVE_LXML:
+        yield from iterparse(source, events=("start", "end"))
+        return
+    try:
+        yield from _lxml_iterparse(source, events=("start", "end"), **_LXML_OPTIONS)
+    except _LxmlSyntaxError as e:
+        raise _to_parse_error(e) from e
+
 
 def _issubclass_safe(cls: Any, classinfo: Any) -> bool:  # pragma: no cover
     """Safe version of issubclass that doesn't raise an exception if the first argument is not a class."""
@@ -31,21 +124,46 @@ def _issubclass_safe(cls: Any, classinfo: Any) -> bool:  # pragma: no cover
         return False
 
 
+_SEQUENCE_ORIGINS = frozenset({list, tuple})
+"""The most common sequence origins, checked before the (slow) `Sequence` ABC."""
+
+
+def _is_sequence(origin: Any) -> bool:
+    """Check whether an annotation origin is a sequence."""
+    return origin in _SEQUENCE_ORIGINS or _issubclass_safe(origin, Sequence)
+
+
 def _get_basemodel_name(_class: Type[BaseModel]) -> str:
-    """Get the name of the base model."""
-    if hasattr(_class, "__xml_name__"):
-        return _class.__xml_name__
+    """Get the name of the base model.
+
+    The name is cached per class, so changing `__xml_name__` or `xml_name` after the class was serialized or
+    deserialized has no effect.
+    """
+    # This is called for every child element, so the cache is read without calling `_get_class_cache`.
+    cache: Optional[_ClassCache] = getattr(_class, _CLASS_CACHE_ATTRIBUTE, None)
+    if cache is not None and cache.model is _class and cache.name is not None:
+        return cache.name
+    name = _get_class_cache(_class).name = _find_basemodel_name(_class)
+    return name
+
+
+def _find_basemodel_name(_class: Type[BaseModel]) -> str:
+    """Find the name of the base model, see `_get_basemodel_name`."""
+    # Names are interned, so that the tag comparisons while parsing can short-circuit on identity.
+    name = getattr(_class, "__xml_name__", None)
+    if isinstance(name, str):
+        return sys.intern(name)
     if hasattr(_class, "model_config"):
         name = _class.model_config.get("xml_name")
         if name is not None and isinstance(name, str):
-            return name
-    return _class.__name__
+            return sys.intern(name)
+    return sys.intern(_class.__name__)
 
 
 def _analyze_sequence(origin: Any, args: Tuple[Any, ...]) -> bool:
     """Analyze the sequence annotation of a field."""
     logger.debug("analyzing sequence: origin: %s, args: %s", origin, args)
-    if _issubclass_safe(origin, Sequence):
+    if _is_sequence(origin):
         if not args:
             raise ValueError(
                 "Invalid list type, must be a list of basemodels (no type args)"
@@ -92,7 +210,7 @@ def _find_basemodel_types(origin: Any, args: Tuple[Any, ...]) -> Set[Type[BaseMo
             if _issubclass_safe(arg, BaseModel):
                 ret.add(arg)
         return ret
-    elif _issubclass_safe(origin, Sequence):
+    elif _is_sequence(origin):
         if not args:
             raise ValueError(
                 "Invalid list type, must be a list of basemodels (no type args)"
@@ -107,6 +225,485 @@ def _find_basemodel_types(origin: Any, args: Tuple[Any, ...]) -> Set[Type[BaseMo
     return ret
 
 
+def _parse_bool(value: str) -> bool:
+    """Convert an XML attribute value to a bool, accepting the same strings as pydantic."""
+    return value.strip().lower() in {"1", "on", "t", "true", "y", "yes"}
+
+
+_SCALAR_CONVERTERS: Dict[Any, Callable[[str], Any]] = {
+    int: int,
+    float: float,
+    bool: _parse_bool,
+}
+"""Converters from attribute strings to the scalar types, used when validation is skipped."""
+
+
+def _find_scalar_converter(
+    origin: Any, args: Tuple[Any, ...]
+) -> Optional[Callable[[str], Any]]:
+    """Find the converter of a scalar annotation, also looking inside `Optional`."""
+    if origin is Union:
+        types = [arg for arg in args if arg is not type(None)]
+        if len(types) != 1:
+            return None
+        origin = types[0]
+    return _SCALAR_CONVERTERS.get(origin)
+
+
+_PLAIN_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+"""Types that are always written as attributes (or text)."""
+
+
+def _is_plain_scalar(origin: Any, args: Tuple[Any, ...]) -> bool:
+    """Check whether an annotation only allows plain scalar types, so its value can never be a model."""
+    if origin is Union:
+        return all(arg in _PLAIN_SCALAR_TYPES for arg in args)
+    return origin in _PLAIN_SCALAR_TYPES
+
+
+def _intern_optional(value: _V) -> _V:
+    """Intern the value if it's a string, otherwise return it as is."""
+    if isinstance(value, str):
+        return sys.intern(value)  # type: ignore[return-value]
+    return value
+
+
+class _FieldKind(IntEnum):
+    """How a field is represented in XML."""
+
+    SCALAR = 0
+    """An attribute, or the element text for `xml_content`."""
+    MODEL = 1
+    """A child element of one of the `basemodel_types`."""
+    MODEL_LIST = 2
+    """Any number of child elements of the `basemodel_types`."""
+
+
+class _FieldPlan(NamedTuple):
+    """Everything about a model field that doesn't depend on the field value."""
+
+    name: str
+    kind: _FieldKind
+    basemodel_types: Tuple[Type[BaseModel], ...]
+    xml_child_tags: Tuple[str, ...]
+    """Element names of the `basemodel_types`, in the same order."""
+    xml_child_types: Dict[str, Type[BaseModel]]
+    """Mapping of the `xml_child_tags` to the `basemodel_types`."""
+    is_xml_content: bool
+    is_plain_scalar: bool
+    """Whether the annotation only allows plain scalar types, see `_is_plain_scalar`."""
+    serialization_alias: Optional[str]
+    serialization_name: str
+    """Attribute name used when dumping by alias."""
+    validation_name: Optional[str]
+    """Attribute name used when loading by alias, `None` if the validation alias isn't a string."""
+    converter: Optional[Callable[[str], Any]]
+    """Converter of the attribute string, used when validation is skipped."""
+
+
+class _ClassCache:
+    """Everything that is cached per model class."""
+
+    __slots__ = ("model", "name", "plans", "loaders", "stream_child_types", "splitters")
+
+    def __init__(self, model: Type[BaseModel]) -> None:
+        self.model = model
+        """The class the cache belongs to, a subclass finds the cache of its parent class as well."""
+        self.name: Optional[str] = None
+        self.plans: Optional[Tuple[_FieldPlan, ...]] = None
+        self.loaders: Dict[Tuple[bool, bool], "_Loader"] = {}
+        """Loaders, keyed by the `by_alias` and `validate` options."""
+        self.stream_child_types: Any = _MISSING
+        """See `_get_stream_child_types`, `_MISSING` until they were looked up (they can be `None`)."""
+        self.splitters: Dict[
+            Tuple[bool, bool], Callable[[BaseModel], "_SplitModel"]
+        ] = {}
+        """Generated splitters, keyed by the `by_alias` and `submodel_by_alias` options."""
+
+
+_CLASS_CACHE_ATTRIBUTE = "__xml_cache__"
+"""Name of the class attribute that holds the `_ClassCache` of a model class."""
+
+
+def _get_class_cache(model: Type[BaseModel]) -> _ClassCache:
+    """Get the cache of a model class.
+
+    The cache is stored on the class itself (like pydantic stores `__pydantic_validator__`), so it's freed together
+    with the class. A subclass finds the cache of its parent class as well, so the owner of the cache is checked.
+    This is faster than reading the class `__dict__`, which creates a proxy object every time.
+    """
+    cache: Optional[_ClassCache] = getattr(model, _CLASS_CACHE_ATTRIBUTE, None)
+    if cache is None or cache.model is not model:
+        cache = _ClassCache(model)
+        # Pydantic resolves forward references lazily, on the first validation. The fields of a model with unresolved
+        # forward references may still change, so nothing is cached for it.
+        if not model.__pydantic_complete__:
+            model.model_rebuild(raise_errors=False)
+        if model.__pydantic_complete__:
+            setattr(model, _CLASS_CACHE_ATTRIBUTE, cache)
+    return cache
+
+
+def _get_field_plans(model: Type[BaseModel]) -> Tuple[_FieldPlan, ...]:
+    """Get the field plans of a model class.
+
+    Analyzing the annotations is relatively slow and depends only on the class, so it's done once per class.
+    """
+    cache = _get_class_cache(model)
+    if cache.plans is not None:
+        return cache.plans
+
+    logger.debug("building field plans for %s", model)
+    ret = []
+    for name, field in model.model_fields.items():
+        if field.annotation is None:
+            raise ValueError(f"Field {name} has no annotation")
+        origin: Any = get_origin(field.annotation)
+        if origin is None:
+            origin = field.annotation
+        args: Tuple[Any, ...] = get_args(field.annotation)
+
+        logger.debug(
+            "field name: %(name)s, field: %(field)s, origin: %(origin)s, args: %(args)s",
+            {"name": name, "field": field, "origin": origin, "args": args},
+        )
+
+        is_list, is_basemodel = _analyze_annotation(origin, args)
+        kind = _FieldKind.SCALAR
+        basemodel_types: Tuple[Type[BaseModel], ...] = ()
+        converter = None
+        if not is_basemodel:
+            converter = _find_scalar_converter(origin, args)
+        else:
+            kind = _FieldKind.MODEL_LIST if is_list else _FieldKind.MODEL
+            basemodel_types = tuple(_find_basemodel_types(origin, args))
+        xml_child_tags = tuple(map(_get_basemodel_name, basemodel_types))
+        serialization_alias = _intern_optional(field.serialization_alias)
+        validation_alias = field.validation_alias or name
+        validation_name = None
+        if isinstance(validation_alias, str):
+            validation_name = _intern_optional(validation_alias)
+
+        ret.append(
+            _FieldPlan(
+                name=name,
+                kind=kind,
+                basemodel_types=basemodel_types,
+                xml_child_tags=xml_child_tags,
+                xml_child_types=dict(zip(xml_child_tags, basemodel_types)),
+                is_xml_content=name == "xml_content",
+                is_plain_scalar=_is_plain_scalar(origin, args),
+                serialization_alias=serialization_alias,
+                serialization_name=serialization_alias or name,
+                validation_name=validation_name,
+                converter=converter,
+            )
+        )
+
+    plans = tuple(ret)
+    cache.plans = plans
+    return plans
+
+
+class _Loader(NamedTuple):
+    """How to load the fields of a model class, for one combination of the `model_validate_xml` options."""
+
+    load_scalars: Callable[[Element, Dict[str, Any]], None]
+    """Generated function that stores the scalar fields of an element in the model data."""
+    submodel_plans: Tuple[Tuple[_FieldPlan, str, str], ...]
+    """Plans of the submodel fields, together with the XML name of each field and the key of its value."""
+
+
+def _compile_scalar_loader(
+    model: Type[BaseModel], plans: Sequence[Tuple[_FieldPlan, str, str]], validate: bool
+) -> Callable[[Element, Dict[str, Any]], None]:
+    """Generate a function that stores the scalar fields of an element in the model data.
+
+    The generated function is straight-line code that hard-codes the attribute names and the data keys of all scalar
+    fields, like the splitters generated by `_compile_splitter`.
+    """
+    namespace: Dict[str, Any] = {}
+    body = []
+    for index, (plan, name, key) in enumerate(plans):
+        if plan.is_xml_content:
+            body.append("    value = element.text")
+        else:
+            body.append(f"    value = get_attribute({name!r})")
+        body.append("    if value is not None:")
+        if not validate and plan.converter is not None:
+            converter = f"_converter_{index}"
+            namespace[converter] = plan.converter
+            body.append(f"        data[{key!r}] = {converter}(value)")
+        else:
+            body.append(f"        data[{key!r}] = value")
+
+    lines = [
+        "def load(element, data):",
+        # `Element.get` is faster than looking up the values in `Element.attrib`, especially with lxml, where
+        # `attrib` is a proxy object.
+        "    get_attribute = element.get",
+        *body,
+    ]
+
+    source = "\n".join(lines)
+    logger.debug("generated scalar loader for %s:\n%s", model, source)
+    exec(compile(source, f"<xml loader of {model.__qualname__}>", "exec"), namespace)
+    return namespace["load"]
+
+
+def _get_loader(model: Type[BaseModel], by_alias: bool, validate: bool) -> _Loader:
+    """Get the loader of a model class.
+
+    The XML names and the data keys depend on the `by_alias` and `validate` options of `model_validate_xml`, so the
+    loaders are cached per combination to keep the alias handling out of the per-element loop.
+    """
+    loaders = _get_class_cache(model).loaders
+    loader = loaders.get((by_alias, validate))
+    if loader is not None:
+        return loader
+
+    scalar_plans = []
+    submodel_plans = []
+    for plan in _get_field_plans(model):
+        name = plan.name
+        if by_alias:
+            if plan.validation_name is None:
+                raise ValueError(f"Field {name} type is not a string")
+            name = plan.validation_name
+        # model_construct() expects field names.
+        load_plan = (plan, name, name if validate else plan.name)
+        if plan.kind is _FieldKind.SCALAR:
+            scalar_plans.append(load_plan)
+        else:
+            submodel_plans.append(load_plan)
+
+    loader = _Loader(
+        load_scalars=_compile_scalar_loader(model, scalar_plans, validate),
+        submodel_plans=tuple(submodel_plans),
+    )
+    loaders[by_alias, validate] = loader
+    return loader
+
+
+def _get_stream_child_types(
+    model: Type[BaseModel],
+) -> Optional[Dict[str, Type[BaseModel]]]:
+    """Get the model classes of the child elements of a model, keyed by their element name.
+
+    `None` is returned if an element name is used by more than one field. Such elements can't be converted while
+    their children are streamed, because each field converts the children with its own model class.
+    """
+    cache = _get_class_cache(model)
+    if cache.stream_child_types is not _MISSING:
+        cached: Optional[Dict[str, Type[BaseModel]]] = cache.stream_child_types
+        return cached
+
+    child_types: Optional[Dict[str, Type[BaseModel]]] = {}
+    for plan in _get_field_plans(model):
+        if child_types is None:
+            break
+        for tag, child_type in plan.xml_child_types.items():
+            if tag in child_types:
+                child_types = None
+                break
+            child_types[tag] = child_type
+
+    cache.stream_child_types = child_types
+    return child_types
+
+
+def _escape_text(text: str) -> str:
+    """Escape the text content of an element."""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def _escape_attrib(text: str) -> str:
+    """Escape an attribute value.
+
+    Carriage returns are written as `&#13;`, like ElementTree does since Python 3.13. Older versions normalize them
+    into newlines, so they wouldn't survive a round trip.
+    """
+    text = _escape_text(text)
+    if '"' in text:
+        text = text.replace('"', "&quot;")
+    if "\r" in text:
+        text = text.replace("\r", "&#13;")
+    if "\n" in text:
+        text = text.replace("\n", "&#10;")
+    if "\t" in text:
+        text = text.replace("\t", "&#09;")
+    return text
+
+
+_SplitModel = Tuple[Dict[str, str], Optional[str], List[Tuple[str, BaseModel]]]
+"""The attributes (already escaped), the text and the child elements (with their names) of a model element."""
+
+_UNESCAPED_TYPES = frozenset({int, float, bool})
+"""Types whose string representation never contains characters that have to be escaped."""
+
+
+def _compile_splitter(
+    model: Type[BaseModel], by_alias: bool, submodel_by_alias: bool
+) -> Callable[[BaseModel], _SplitModel]:
+    """Generate a function that splits instances of a model class, see `_split_model`.
+
+    The generated function is straight-line code that hard-codes the names of all fields, without any field plan
+    lookups or branches on the options.
+    """
+    lines = [
+        "def split(obj):",
+        "    values = obj.__dict__",
+        "    attrib = {}",
+        "    text = None",
+        "    children = []",
+    ]
+    for plan in _get_field_plans(model):
+        alias = plan.serialization_alias
+        lines += [
+            f"    value = values.get({plan.name!r}, _MISSING)",
+            "    if value is _MISSING:",
+            f"        value = getattr(obj, {plan.name!r})",
+        ]
+        if plan.kind is _FieldKind.MODEL_LIST:
+            if submodel_by_alias and alias is not None:
+                child_name = repr(alias)
+            else:
+                child_name = "_get_basemodel_name(type(item))"
+            # A list comprehension adds all items at once, without a method call per item.
+            lines += [
+                "    if value is not None:",
+                f"        children += [({child_name}, item) for item in value if isinstance(item, BaseModel)]",
+            ]
+            continue
+        # Unset optional fields are the most common case, so `None` is checked before anything else.
+        lines.append("    if value is not None:")
+        indent = " " * 8
+        if not plan.is_plain_scalar:
+            if submodel_by_alias and alias is not None:
+                child_name = repr(alias)
+            else:
+                child_name = "_get_basemodel_name(type(value))"
+            lines += [
+                "        if isinstance(value, BaseModel):",
+                f"            children.append(({child_name}, value))",
+                "        else:",
+            ]
+            indent = " " * 12
+        if plan.is_xml_content:
+            lines.append(f"{indent}text = value if type(value) is str else str(value)")
+            continue
+        attribute = plan.serialization_name if by_alias else plan.name
+        target = f"attrib[{attribute!r}]"
+        # Numbers and bools don't have to be escaped.
+        lines += [
+            f"{indent}if type(value) is str:",
+            f"{indent}    {target} = _escape_attrib(value)",
+            f"{indent}elif type(value) in _UNESCAPED_TYPES:",
+            f"{indent}    {target} = str(value)",
+            f"{indent}else:",
+            f"{indent}    {target} = _escape_attrib(str(value))",
+        ]
+    lines.append("    return attrib, text, children")
+
+    source = "\n".join(lines)
+    logger.debug("generated splitter for %s:\n%s", model, source)
+    namespace: Dict[str, Any] = {
+        "_MISSING": _MISSING,
+        "BaseModel": BaseModel,
+        "_get_basemodel_name": _get_basemodel_name,
+        "_escape_attrib": _escape_attrib,
+        "_UNESCAPED_TYPES": _UNESCAPED_TYPES,
+    }
+    exec(compile(source, f"<xml splitter of {model.__qualname__}>", "exec"), namespace)
+    return namespace["split"]
+
+
+def _split_model(
+    obj: BaseModel, by_alias: bool, submodel_by_alias: bool
+) -> _SplitModel:
+    """Split a model into the attributes, the text and the child elements of its XML element."""
+    logger.debug("converting (%s) %s to xml", obj.__class__.__name__, obj)
+    model = type(obj)
+    # This is called for every element, so the cache is read without calling `_get_class_cache`.
+    cache: Optional[_ClassCache] = getattr(model, _CLASS_CACHE_ATTRIBUTE, None)
+    splitter = None
+    if cache is not None and cache.model is model:
+        splitter = cache.splitters.get((by_alias, submodel_by_alias))
+    if splitter is None:
+        splitter = _compile_splitter(model, by_alias, submodel_by_alias)
+        _get_class_cache(model).splitters[by_alias, submodel_by_alias] = splitter
+    return splitter(obj)
+
+
+def _qualify_name(name: str, namespaces: Dict[str, str]) -> str:
+    """Replace the `{uri}` of a namespaced name with a prefix.
+
+    The prefixes are assigned like ElementTree assigns them. `namespaces` maps the URIs of the document to their
+    prefixes, new ones are added to it.
+    """
+    if name[:1] != "{":
+        return name
+    uri, local_name = name[1:].rsplit("}", 1)
+    prefix = namespaces.get(uri)
+    if prefix is None:
+        prefix = _ET_NAMESPACE_PREFIXES.get(uri)
+        if prefix is None:
+            prefix = f"ns{len(namespaces)}"
+        # The `xml` prefix is bound by definition and is never declared.
+        if prefix != "xml":
+            namespaces[uri] = prefix
+    return f"{prefix}:{local_name}" if prefix else local_name
+
+
+def _declare_namespaces(uris: Iterable[str], namespaces: Dict[str, str]) -> str:
+    """Generate the `xmlns` attributes that declare the prefixes of the namespaces, ordered by prefix."""
+    declarations = sorted((namespaces[uri], uri) for uri in uris)
+    return "".join(
+        [
+            f' xmlns{":" if prefix else ""}{prefix}="{_escape_attrib(uri)}"'
+            for prefix, uri in declarations
+        ]
+    )
+
+
+def _qualify_start(
+    tag: str,
+    attrib: Dict[str, str],
+    namespaces: Dict[str, str],
+    declared: Optional[Set[str]],
+) -> Tuple[str, str, FrozenSet[str]]:
+    """Replace the `{uri}` of the names in a start tag with prefixes, see `_iter_xml`.
+
+    If `declared` (the namespaces declared by the enclosing elements) is given, the namespaces the element uses that
+    aren't declared yet are declared on it.
+
+    Returns:
+        The tag, the start tag (without the `<`) and the namespaces that were declared on it.
+    """
+    qualified_tag = _qualify_name(tag, namespaces)
+    attributes = "".join(
+        [
+            f' {_qualify_name(key, namespaces)}="{value}"'
+            for key, value in attrib.items()
+        ]
+    )
+    if declared is None:
+        return qualified_tag, qualified_tag + attributes, frozenset()
+    uris = {name[1:].rsplit("}", 1)[0] for name in (tag, *attrib) if name[:1] == "{"}
+    scope = frozenset(uri for uri in uris if uri in namespaces and uri not in declared)
+    return (
+        qualified_tag,
+        qualified_tag + _declare_namespaces(scope, namespaces) + attributes,
+        scope,
+    )
+
+
 def model_dump_xml(
     model: BaseModel,
     include_xml_version: bool = False,
@@ -124,91 +721,127 @@ def model_dump_xml(
     Returns:
         The XML string.
     """
-    root = Element(_get_basemodel_name(type(model)))
-
-    def select_name(name: str, alias: Optional[str]) -> str:
-        if by_alias and alias is not None:
-            return alias
-        return name
-
-    def select_submodel_name(name: str, alias: Optional[str]) -> str:
-        if submodel_by_alias and alias is not None:
-            return alias
-        return name
-
-    def convert_to_xml(element: Element, obj: BaseModel) -> None:
-        """Inner function to convert a pydantic model to xml."""
-        logger.debug("converting (%s) %s to xml", obj.__class__.__name__, obj)
-        for name, field in obj.model_fields.items():
-            value = getattr(obj, name)
-
-            if field.annotation is None:
-                raise ValueError(f"Field {name} has no annotation")
-            origin: Any = get_origin(field.annotation)
-            if origin is None:
-                origin = field.annotation
-            args: Tuple[Any, ...] = get_args(field.annotation)
-
-            logger.debug(
-                "field name: %(name)s, field: %(field)s, origin: %(origin)s, args: %(args)s",
-                {"name": name, "field": field, "origin": origin, "args": args},
-            )
-
-            is_xml_content = name == "xml_content"
-            is_list, _ = _analyze_annotation(origin, args)
-
-            if is_list:
-                if value is None:
-                    continue
-                for single_value in value:
-                    if isinstance(single_value, BaseModel):
-                        name = _get_basemodel_name(type(single_value))
-                        sub_element = SubElement(
-                            element,
-                            select_submodel_name(name, field.serialization_alias),
-                        )
-                        convert_to_xml(sub_element, single_value)
-            else:
-                if isinstance(value, BaseModel):
-                    name = _get_basemodel_name(type(value))
-                    sub_element = SubElement(
-                        element, select_submodel_name(name, field.serialization_alias)
-                    )
-                    convert_to_xml(sub_element, value)
-                else:
-                    if value is None:
-                        continue
-                    if is_xml_content:
-                        element.text = str(value)
-                    else:
-                        element.set(
-                            select_name(name, field.serialization_alias), str(value)
-                        )
-
-    convert_to_xml(root, model)
-    xml_string = tostring(root, encoding="unicode")
-
-    if include_xml_version:
-        xml_string = '<?xml version="1.0" ?>' + xml_string
+    # Writing the strings directly is much faster than building an element tree and serializing it afterwards. The
+    # declaration is joined with the other chunks, so the document isn't copied once more to prepend it.
+    chunks = [_XML_DECLARATION] if include_xml_version else []
+    root = len(chunks)
+    namespaces: Dict[str, str] = {}
+    chunks.extend(_iter_xml(model, by_alias, submodel_by_alias, namespaces))
+    if namespaces:
+        # Like ElementTree, all namespaces are declared on the root element, right after its name.
+        position = 1 + len(_qualify_name(_get_basemodel_name(type(model)), namespaces))
+        start = chunks[root]
+        chunks[root] = (
+            start[:position]
+            + _declare_namespaces(namespaces, namespaces)
+            + start[position:]
+        )
+    return "".join(chunks)
 
-    return xml_string
 
+def _iter_xml(
+    model: BaseModel,
+    by_alias: bool,
+    submodel_by_alias: bool,
+    namespaces: Optional[Dict[str, str]] = None,
+) -> Iterator[str]:
+    """Generate the XML of a model piece by piece, without building an element tree.
+
+    The output matches `xml.etree.ElementTree.tostring` (of Python 3.13), including the space before the slash of empty
+    elements. Before Python 3.13, ElementTree wrote carriage returns in attribute values as newlines, see
+    `_escape_attrib`.
+
+    Names in the `{uri}local` form get namespace prefixes like ElementTree assigns them. If `namespaces` is given, it
+    collects the prefixes of the document, and the caller declares them on the root element, like ElementTree does.
+    Otherwise, the root element is written before all namespaces are known, so each namespace is declared on the
+    outermost elements that use it instead.
+    """
+    # The namespaces declared by the open elements, if they are declared where they're used.
+    declared: Optional[Set[str]] = None
+    if namespaces is None:
+        namespaces = {}
+        declared = set()
+    # The stack holds models that still have to be written, the closing tags of the open elements and the namespaces
+    # declared by them, which go out of scope when the element is closed.
+    stack: List[Union[str, FrozenSet[str], Tuple[str, BaseModel]]] = [
+        (_get_basemodel_name(type(model)), model)
+    ]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+            continue
+        if isinstance(item, frozenset):
+            if declared is not None:
+                declared -= item
+            continue
+        tag, obj = item
+        attrib, text, children = _split_model(obj, by_alias, submodel_by_alias)
+        # `str.join` turns a generator into a list first anyway, so a list comprehension is faster.
+        start = tag + "".join([f' {key}="{value}"' for key, value in attrib.items()])
+        # Namespaced names are rare, so they are only looked for if there's a brace at all.
+        if "{" in start:
+            tag, start, scope = _qualify_start(tag, attrib, namespaces, declared)
+            if scope and declared is not None and (text or children):
+                declared |= scope
+                stack.append(scope)
+        if text or children:
+            yield f"<{start}>{_escape_text(text) if text else ''}"
+            stack.append(f"</{tag}>")
+            stack.extend(reversed(children))
+        else:
+            yield f"<{start} />"
+
+
+def model_dump_xml_to_stream(
+    model: BaseModel,
+    stream: IO[bytes],
+    include_xml_version: bool = False,
+    by_alias: bool = False,
+    submodel_by_alias: bool = False,
+) -> None:
+    """Write a Pydantic model as UTF-8 encoded XML to a binary stream.
 
-def model_validate_xml(model: Type[_T], xml_string: str, by_alias: bool = True) -> _T:
-    """Convert an XML string to a pydantic model.
+    The XML is written while the model is traversed, so the whole document is never held in memory. The output is the
+    same as the one of `model_dump_xml`, except that namespaces are declared on the outermost elements that use them
+    instead of the root element.
 
     Args:
         model: The Pydantic model to convert.
-        xml_string: The XML string.
+        stream: The binary stream (e.g. a file opened with `"wb"`) to write to.
+        include_xml_version: Whether to include the XML version in the XML string.
         by_alias: Whether to use the alias in the XML string.
-
-    Returns:
-        The Pydantic model.
+        submodel_by_alias: Whether to use the alias in the XML string for submodels.
     """
-    root = fromstring(xml_string)
+    if include_xml_version:
+        stream.write(_XML_DECLARATION_BYTES)
+    for chunk in _iter_xml(model, by_alias, submodel_by_alias):
+        stream.write(chunk.encode("utf-8"))
+
+
+def _convert_element(
+    root: Element, model: Type[BaseModel], by_alias: bool, validate: bool
+) -> Any:
+    """Convert an XML element to a pydantic model (or its data, if it's validated later)."""
+    # The models are converted with an explicit stack instead of recursion, so deep documents don't hit the recursion
+    # limit. Each entry is (element, model, container, key, data): the converted element is stored in `container`
+    # under `key`, or appended to it if `key` is `None`. An entry without element finishes `data` after all its
+    # children were converted.
+    holder: List[Any] = []
+    stack: List[
+        Tuple[Optional[Element], Type[BaseModel], Any, Optional[str], Dict[str, Any]]
+    ] = [(root, model, holder, None, {})]
+    while stack:
+        element, obj, container, container_key, data = stack.pop()
+        if element is None:
+            logger.debug("data: %s", data)
+            value: Any = data if validate else obj.model_construct(**data)
+            if container_key is None:
+                container.append(value)
+            else:
+                container[container_key] = value
+            continue
 
-    def convert_from_xml(element: Element, obj: Type[BaseModel]) -> Dict[str, Any]:
-        """Inner function to convert an xml element to a pydantic model."""
         logger.debug("converting xml element to model: %s", element)
         logger.debug(
             "element.tag: %s, element.text: %s, element.attrib: %s",
@@ -217,67 +850,159 @@ def model_validate_xml(model: Type[_T], xml_string: str, by_alias: bool = True)
             element.attrib,
         )
 
-        data: Dict[str, Any] = {}
-
-        for name, field in obj.model_fields.items():
-            if field.annotation is None:
-                raise ValueError(f"Field {name} has no annotation")
-            origin: Any = get_origin(field.annotation)
-            if origin is None:
-                origin = field.annotation
-            args: Tuple[Any, ...] = get_args(field.annotation)
-
-            logger.debug(
-                "field name: %(name)s, field: %(field)s, origin: %(origin)s, args: %(args)s",
-                {"name": name, "field": field, "origin": origin, "args": args},
-            )
-
-            is_list, is_basemodel = _analyze_annotation(origin, args)
-            is_xml_content = name == "xml_content"
-
-            if by_alias:
-                temp_name = field.validation_alias or name
-                if not isinstance(temp_name, str):
-                    raise ValueError(f"Field {name} type is not a string")
-                name = temp_name
-
-            if is_basemodel and not is_list:
-                logger.debug("is_basemodel and not is_list")
-                basemodel_types = _find_basemodel_types(origin, args)
-                if not basemodel_types:
+        stack.append((None, obj, container, container_key, data))
+        children: List[
+            Tuple[Element, Type[BaseModel], Any, Optional[str], Dict[str, Any]]
+        ] = []
+        load_scalars, submodel_plans = _get_loader(obj, by_alias, validate)
+        load_scalars(element, data)
+        for plan, name, key in submodel_plans:
+            logger.debug("field name: %s, kind: %s", name, plan.kind.name)
+            if plan.kind is _FieldKind.MODEL:
+                if not plan.basemodel_types:
                     raise ValueError(f"Field {name} has no basemodel types")
-                for basemodel_type in basemodel_types:
-                    sub_element = element.find(_get_basemodel_name(basemodel_type))
+                for tag, basemodel_type in zip(
+                    plan.xml_child_tags, plan.basemodel_types
+                ):
+                    sub_element = element.find(tag)
                     logger.debug("sub_element: %s", sub_element)
                     if sub_element is None:
                         continue
-                    data[name] = convert_from_xml(sub_element, basemodel_type)
-            elif is_basemodel and is_list:
-                logger.debug("is_basemodel and is_list")
-                basemodel_types = _find_basemodel_types(origin, args)
-                if not basemodel_types:
+                    children.append((sub_element, basemodel_type, data, key, {}))
+            else:
+                if not plan.basemodel_types:
                     raise ValueError(f"Field {name} has no basemodel type")
-                data[name] = []
-                for basemodel_type in basemodel_types:
-                    logger.debug("searching basemodel type: %s", basemodel_type)
-                    sub_elements = element.findall(_get_basemodel_name(basemodel_type))
-                    data[name] += [
-                        convert_from_xml(sub_element, basemodel_type)
-                        for sub_element in sub_elements
-                    ]
+                # A single pass over the children keeps the document order, even if there are multiple types.
+                child_types = plan.xml_child_types
+                items: List[Any] = []
+                for sub_element in element:
+                    child_type = child_types.get(sub_element.tag)
+                    if child_type is not None:
+                        children.append((sub_element, child_type, items, None, {}))
+                data[key] = items
+        # Reversed, so the children are converted in document order.
+        stack.extend(reversed(children))
+
+    return holder[0]
+
+
+def _convert_stream(
+    source: IO[bytes], model: Type[BaseModel], by_alias: bool, validate: bool
+) -> Any:
+    """Convert a binary XML stream to a pydantic model (or its data, if it's validated later).
+
+    The elements are converted while the document is parsed and removed from their parents afterwards, so the element
+    tree of the whole document is never held in memory. Elements of models whose child elements can't be told apart
+    by their names (see `_get_stream_child_types`) are kept until they are complete and converted with
+    `_convert_element`.
+    """
+    result: Any = None
+    # Each entry is (element, model, children) for an open element, where `children` collects the converted child
+    # elements with their names. `model` is `None` for elements that aren't converted. `children` is `None` for
+    # elements that are converted with `_convert_element`, and for all their descendants, which must be kept.
+    stack: List[
+        Tuple[Element, Optional[Type[BaseModel]], Optional[List[Tuple[str, Any]]]]
+    ] = []
+    for event, element in _iterparse(source):
+        if event == "start":
+            if not stack:
+                obj: Optional[Type[BaseModel]] = model
             else:
-                logger.debug("not is_basemodel")
-                if is_xml_content:
-                    value = element.text
-                else:
-                    value = element.get(name)
-                if value is None:
+                _, parent, siblings = stack[-1]
+                if siblings is None:
+                    stack.append((element, None, None))
                     continue
-                data[name] = value
+                obj = None
+                if parent is not None:
+                    child_types = _get_stream_child_types(parent)
+                    if child_types is not None:
+                        obj = child_types.get(element.tag)
+            if obj is not None and _get_stream_child_types(obj) is None:
+                stack.append((element, obj, None))
+            else:
+                stack.append((element, obj, []))
+            continue
+
+        _, obj, children = stack.pop()
+        if obj is None and children is None:
+            continue
+
+        if obj is None:
+            value: Any = _MISSING
+        elif children is None:
+            value = _convert_element(element, obj, by_alias, validate)
+        else:
+            first_children: Dict[str, Any] = {}
+            for child_tag, child in children:
+                first_children.setdefault(child_tag, child)
+
+            data: Dict[str, Any] = {}
+            load_scalars, submodel_plans = _get_loader(obj, by_alias, validate)
+            load_scalars(element, data)
+            for plan, name, key in submodel_plans:
+                if plan.kind is _FieldKind.MODEL:
+                    if not plan.basemodel_types:
+                        raise ValueError(f"Field {name} has no basemodel types")
+                    # Like `Element.find`, the first child with a matching name is used.
+                    for child_tag in plan.xml_child_tags:
+                        if child_tag in first_children:
+                            data[key] = first_children[child_tag]
+                else:
+                    if not plan.basemodel_types:
+                        raise ValueError(f"Field {name} has no basemodel type")
+                    child_types = plan.xml_child_types
+                    data[key] = [
+                        child
+                        for child_tag, child in children
+                        if child_tag in child_types
+                    ]
 
-        logger.debug("data: %s", data)
-        return data
+            logger.debug("data: %s", data)
+            value = data if validate else obj.model_construct(**data)
+
+        if not stack:
+            result = value
+            continue
+        parent_element, _, siblings = stack[-1]
+        if siblings is not None and value is not _MISSING:
+            siblings.append((element.tag, value))
+        # The converted element isn't needed anymore. All earlier siblings were removed already, so it's normally the
+        # first child of its parent (the parser may have added later siblings already).
+        if parent_element[0] is element:
+            del parent_element[0]
+        else:
+            parent_element.remove(element)
+
+    return result
+
+
+def model_validate_xml(
+    model: Type[_T],
+    xml_string: Union[str, bytes, IO[bytes]],
+    by_alias: bool = True,
+    validate: bool = True,
+) -> _T:
+    """Convert an XML string to a pydantic model.
 
-    obj = convert_from_xml(root, model)
+    Args:
+        model: The Pydantic model to convert.
+        xml_string: The XML string. Bytes and binary file-like objects are accepted as well, parsing them is faster
+            because the string doesn't have to be encoded first. File-like objects are converted while they are
+            parsed, without building the element tree of the whole document.
+        by_alias: Whether to use the alias in the XML string.
+        validate: Whether to validate the data. If `False`, the models are created with `model_construct()`, which
+            is much faster but should only be used for trusted XML. Only `int`, `float` and `bool` attributes are
+            converted, all other values are kept as strings.
 
+    Returns:
+        The Pydantic model.
+    """
+    obj: Any
+    if isinstance(xml_string, (str, bytes)):
+        obj = _convert_element(_parse_xml(xml_string), model, by_alias, validate)
+    else:
+        obj = _convert_stream(xml_string, model, by_alias, validate)
+
+    if not validate:
+        return obj
     return model.model_validate(obj)
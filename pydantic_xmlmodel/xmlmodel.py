@@ -1,7 +1,7 @@
 """A module that contains the XMLModel class."""
 
 import warnings
-from typing import Any, Optional, Type, TypeVar, no_type_check
+from typing import IO, Any, Optional, Type, TypeVar, Union, no_type_check
 
 from pydantic import BaseModel, ConfigDict
 from pydantic._internal._model_construction import ModelMetaclass
@@ -111,32 +111,46 @@ class XMLModel(BaseModel, metaclass=XMLModelMeta):
 
     @classmethod
     @deprecated("Use `model_validate_xml()` instead.")
-    def from_xml(cls: Type[_S], xml_string: str, by_alias: bool = True) -> _S:
+    def from_xml(
+        cls: Type[_S],
+        xml_string: Union[str, bytes, IO[bytes]],
+        by_alias: bool = True,
+        validate: bool = True,
+    ) -> _S:
         """Convert an XML string to a model.
 
         Deprecated. Use `model_validate_xml()` instead.
 
         Args:
-            xml_string: The XML string.
+            xml_string: The XML string, bytes or a binary file-like object.
             by_alias: Whether to use the alias in the XML string.
+            validate: Whether to validate the data. If `False`, the model is created with `model_construct()`, use it
+                only for trusted XML.
 
         Returns:
             The model.
         """
-        return convert_xml_to_model(cls, xml_string, by_alias=by_alias)  # type: ignore[type-var]
+        return convert_xml_to_model(cls, xml_string, by_alias=by_alias, validate=validate)  # type: ignore[type-var]
 
     @classmethod
-    def model_validate_xml(cls: Type[_S], xml_string: str, by_alias: bool = True) -> _S:
+    def model_validate_xml(
+        cls: Type[_S],
+        xml_string: Union[str, bytes, IO[bytes]],
+        by_alias: bool = True,
+        validate: bool = True,
+    ) -> _S:
         """Convert an XML string to a model.
 
         Args:
-            xml_string: The XML string.
+            xml_string: The XML string, bytes or a binary file-like object.
             by_alias: Whether to use the alias in the XML string.
+            validate: Whether to validate the data. If `False`, the model is created with `model_construct()`, use it
+                only for trusted XML.
 
         Returns:
             The model.
         """
-        return convert_xml_to_model(cls, xml_string, by_alias=by_alias)  # type: ignore[type-var]
+        return convert_xml_to_model(cls, xml_string, by_alias=by_alias, validate=validate)  # type: ignore[type-var]
 
 
 class XMLConfigDict(ConfigDict, total=False):
@@ -194,14 +208,21 @@ class BaseModelXML(BaseModel):
         )
 
     @classmethod
-    def model_validate_xml(cls: Type[_S], xml_string: str, by_alias: bool = True) -> _S:
+    def model_validate_xml(
+        cls: Type[_S],
+        xml_string: Union[str, bytes, IO[bytes]],
+        by_alias: bool = True,
+        validate: bool = True,
+    ) -> _S:
         """Convert an XML string to a model.
 
         Args:
-            xml_string: The XML string.
+            xml_string: The XML string, bytes or a binary file-like object.
             by_alias: Whether to use the alias in the XML string.
+            validate: Whether to validate the data. If `False`, the model is created with `model_construct()`, use it
+                only for trusted XML.
 
         Returns:
             The model.
         """
-        return convert_xml_to_model(cls, xml_string, by_alias=by_alias)  # type: ignore[type-var]
+        return convert_xml_to_model(cls, xml_string, by_alias=by_alias, validate=validate)  # type: ignore[type-var]
@@ -1,6 +1,8 @@
-from typing import List
+from io import BytesIO
+from typing import List, Tuple
 
 import pytest
+from pydantic import Field
 
 from pydantic_xmlmodel.xmlmodel import XMLModel
 
@@ -223,3 +225,72 @@ def test_xml_content_list_load() -> None:
     assert model.xml_content[0].xml_content == "0"
     assert model.xml_content[1].xml_content == "1"
     assert model.xml_content[2].xml_content == "2"
+
+
+class XmlTupleModel(XMLModel, xml_name="test"):
+    pair: Tuple[XmlAttrList1Model, XmlAttrList2Model]
+
+
+def test_xml_tuple_load_keeps_document_order() -> None:
+    # Arrange
+    xml = "<test><list1>1</list1><list2>2</list2></test>"
+
+    # Act
+    model = XmlTupleModel.from_xml(xml)
+
+    # Assert
+    assert model.pair[0].xml_content == "1"
+    assert model.pair[1].xml_content == "2"
+
+
+class XmlSharedNameListModel(XMLModel, xml_name="test"):
+    first: XmlAttrList1Model
+    list1: List[XmlAttrList1Model]
+
+
+def test_xml_list_load_stream() -> None:
+    # Arrange
+    xml = (
+        b"<test><test_inner>a</test_inner><list1>1</list1><unknown><list1>x</list1></unknown>"
+        b"<!-- comment --><list2>2</list2><?pi data?><test_inner>b<!-- comment -->c</test_inner></test>"
+    )
+
+    # Act
+    model = XmlAttrListAndContentModel.model_validate_xml(BytesIO(xml))
+
+    # Assert
+    assert model == XmlAttrListAndContentModel.model_validate_xml(xml)
+    assert [item.xml_content for item in model.xml_content] == ["a", "bc"]
+    assert [item.xml_content for item in model.list1] == ["1"]
+    assert [item.xml_content for item in model.list2] == ["2"]
+
+
+def test_xml_list_load_stream_shared_name() -> None:
+    # Arrange
+    xml = b"<test><list1>1</list1><list1>2</list1></test>"
+
+    # Act
+    model = XmlSharedNameListModel.model_validate_xml(BytesIO(xml))
+
+    # Assert
+    assert model.first.xml_content == "1"
+    assert [item.xml_content for item in model.list1] == ["1", "2"]
+
+
+class XmlListAliasModel(XMLModel, xml_name="test"):
+    first: XmlAttrList1Model = Field(serialization_alias="head")
+    list2: List[XmlAttrList2Model] = Field(serialization_alias="item")
+
+
+def test_xml_list_submodel_by_alias() -> None:
+    # Arrange
+    model = XmlListAliasModel(
+        first=XmlAttrList1Model(xml_content="0"),
+        list2=[XmlAttrList2Model(xml_content="1"), XmlAttrList2Model(xml_content="2")],
+    )
+
+    # Act
+    result = model.model_dump_xml(include_xml_version=False, submodel_by_alias=True)
+
+    # Assert
+    assert result == "<test><head>0</head><item>1</item><item>2</item></test>"
@@ -1,9 +1,17 @@
+import gc
+import weakref
+from io import BytesIO
+from typing import Optional
 from xml.etree.ElementTree import ParseError
 
 import pytest
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, ValidationError, create_model
 
-from pydantic_xmlmodel.serde import model_dump_xml, model_validate_xml
+from pydantic_xmlmodel.serde import (
+    model_dump_xml,
+    model_dump_xml_to_stream,
+    model_validate_xml,
+)
 from pydantic_xmlmodel.xmlmodel import BaseModelXML, XMLConfigDict, XMLModel
 
 
@@ -39,6 +47,19 @@ class ExampleModelEmpty(XMLModel, xml_name="test"):
     pass
 
 
+class ExampleModelWithoutXmlName(XMLModel):
+    name: str
+
+
+class ExampleModelWithForwardRef(BaseModelXML):
+    value: str
+    referenced: Optional["ExampleModelReferenced"] = None
+
+
+class ExampleModelReferenced(BaseModelXML):
+    name: str
+
+
 class ExampleModelWithSameNameInAttrAndChild(XMLModel, xml_name="test2"):
     test: str
     test_model: ExampleModelEmpty
@@ -291,3 +312,212 @@ def test_from_xml_with_same_attr() -> None:
 
     # Assert
     assert result.to_xml() == model.to_xml()
+
+
+def test_to_xml_stream() -> None:
+    # Arrange
+    model = ExampleModelWithPydantic(value=PydanticModel(name="test", value=123))
+    stream = BytesIO()
+
+    # Act
+    model_dump_xml_to_stream(model, stream, include_xml_version=True)
+
+    # Assert
+    assert (
+        b'<?xml version="1.0" ?><example><PydanticModel name="test" value="123" /></example>'
+        == stream.getvalue()
+    )
+
+
+def test_to_xml_special_characters() -> None:
+    # Arrange
+    model = ExampleModelWithSameNameInAttrAndChild(
+        test='<"caf\u00e9" & \t\n>', test_model=ExampleModelEmpty()
+    )
+
+    # Act
+    result = model_dump_xml(model)
+
+    # Assert
+    assert (
+        result
+        == '<test2 test="&lt;&quot;caf\u00e9&quot; &amp; &#09;&#10;&gt;"><test /></test2>'
+    )
+
+
+def test_to_xml_escapes_non_string_values() -> None:
+    # Arrange
+    model = ExampleModel.model_construct(name=["<&>"], value=1.5)
+
+    # Act
+    result = model_dump_xml(model)
+
+    # Assert
+    assert result == '<example name="[\'&lt;&amp;&gt;\']" value="1.5" />'
+
+
+def test_to_xml_carriage_return() -> None:
+    # Arrange
+    model = ExampleModel(name="a\r\nb\rc", value=1)
+
+    # Act
+    result = model_dump_xml(model)
+
+    # Assert
+    assert result == '<example name="a&#13;&#10;b&#13;c" value="1" />'
+    assert ExampleModel.model_validate_xml(result) == model
+
+
+def test_to_xml_stream_special_characters() -> None:
+    # Arrange
+    model = ExampleModelWithSameNameInAttrAndChild(
+        test='<"caf\u00e9" & \t\n>', test_model=ExampleModelEmpty()
+    )
+    stream = BytesIO()
+
+    # Act
+    model_dump_xml_to_stream(model, stream)
+
+    # Assert
+    assert model_dump_xml(model).encode("utf-8") == stream.getvalue()
+
+
+def test_from_xml_bytes() -> None:
+    # Arrange
+    xml = '<example name="café" value="123"/>'.encode("utf-8")
+
+    # Act
+    model = ExampleModel.model_validate_xml(xml)
+
+    # Assert
+    assert model.name == "café"
+    assert model.value == 123
+
+
+def test_from_xml_stream() -> None:
+    # Arrange
+    stream = BytesIO(b'<?xml version="1.0" ?><example name="test" value="123"/>')
+
+    # Act
+    model = ExampleModel.model_validate_xml(stream)
+
+    # Assert
+    assert model.name == "test"
+    assert model.value == 123
+
+
+def test_from_xml_stream_invalid_xml() -> None:
+    # Arrange
+    stream = BytesIO(b"<example>")
+
+    # Act and assert
+    with pytest.raises(ParseError):
+        ExampleModel.model_validate_xml(stream)
+
+
+def test_from_xml_without_validation() -> None:
+    # Arrange
+    xml = '<example><PydanticModel name="test" value="123"/></example>'
+
+    # Act
+    model = ExampleModelWithPydantic.model_validate_xml(xml, validate=False)
+
+    # Assert
+    assert isinstance(model.value, PydanticModel)
+    assert model.value.name == "test"
+    assert model.value.value == 123
+
+
+def test_from_xml_without_validation_skips_checks() -> None:
+    # Arrange
+    xml = '<example name="test"/>'
+
+    # Act
+    model = model_validate_xml(ExampleModel, xml, validate=False)
+
+    # Assert
+    assert model.name == "test"
+    assert "value" not in model.model_fields_set
+
+
+def test_from_xml_deprecated_without_validation() -> None:
+    # Arrange
+    xml = '<example name="test" value="123"/>'
+
+    # Act
+    model = ExampleModel.from_xml(xml, validate=False)
+
+    # Assert
+    assert model.name == "test"
+    assert model.value == 123
+
+
+def test_from_xml_large_attribute() -> None:
+    # Arrange
+    name = "x" * 11_000_000
+    xml = f'<example name="{name}" value="123"/>'
+
+    # Act
+    model = ExampleModel.model_validate_xml(xml)
+
+    # Assert
+    assert model.name == name
+
+
+def test_to_xml_without_xml_name() -> None:
+    # Arrange
+    model = ExampleModelWithoutXmlName(name="test")
+
+    # Act
+    result = model.to_xml(include_xml_version=False)
+
+    # Assert
+    assert '<ExampleModelWithoutXmlName name="test" />' == result
+
+
+def test_dynamic_models_are_freed() -> None:
+    # Arrange
+    model_class = create_model("DynamicModel", __base__=XMLModel, name=(str, ...))
+    xml = model_class(name="test").model_dump_xml()
+    model_class.model_validate_xml(xml)
+    model_class.model_validate_xml(BytesIO(xml.encode("utf-8")))
+    reference = weakref.ref(model_class)
+
+    # Act
+    del model_class
+    gc.collect()
+
+    # Assert
+    assert reference() is None
+
+
+class ExampleModelSubclass(ExampleModel):
+    __xml_name__ = "subclass"
+    extra: str = "extra"
+
+
+def test_to_xml_subclass_after_parent() -> None:
+    # Arrange
+    parent = ExampleModel(name="test", value=1)
+    child = ExampleModelSubclass(name="test", value=1)
+
+    # Act
+    parent_result = model_dump_xml(parent)
+    child_result = model_dump_xml(child)
+
+    # Assert
+    assert parent_result == '<example name="test" value="1" />'
+    assert child_result == '<subclass name="test" value="1" extra="extra" />'
+
+
+def test_from_xml_forward_ref() -> None:
+    # Arrange
+    xml = '<ExampleModelWithForwardRef value="1"><ExampleModelReferenced name="test"/></ExampleModelWithForwardRef>'
+
+    # Act
+    first = ExampleModelWithForwardRef.model_validate_xml(xml)
+    second = ExampleModelWithForwardRef.model_validate_xml(xml)
+
+    # Assert
+    assert first.referenced == ExampleModelReferenced(name="test")
+    assert second == first
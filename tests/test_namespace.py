@@ -1,5 +1,8 @@
+from io import BytesIO
+
 from pydantic import Field
 
+from pydantic_xmlmodel.serde import model_dump_xml_to_stream
 from pydantic_xmlmodel.xmlmodel import XMLModel
 
 
@@ -12,6 +15,17 @@ class NamespaceModel(XMLModel, xml_name="namespace"):
     inner: NamespaceInnerModel
 
 
+class QualifiedInnerModel(XMLModel, xml_name="{http://test.com}inner"):
+    value: str = Field(
+        serialization_alias="{http://other.com}value",
+        validation_alias="{http://other.com}value",
+    )
+
+
+class QualifiedModel(XMLModel, xml_name="{http://test.com}namespace"):
+    inner: QualifiedInnerModel
+
+
 def test_namespace() -> None:
     # Arrange
     model = NamespaceModel(inner=NamespaceInnerModel())
@@ -36,3 +50,38 @@ def test_namespace() -> None:
 
 #     # Assert
 #     assert model.inner is not None
+
+
+def test_namespace_qualified_names() -> None:
+    # Arrange
+    model = QualifiedModel(
+        inner=QualifiedInnerModel.model_validate({"{http://other.com}value": "1"})
+    )
+
+    # Act
+    result = model.to_xml(include_xml_version=False, by_alias=True)
+
+    # Assert
+    assert (
+        '<ns0:namespace xmlns:ns0="http://test.com" xmlns:ns1="http://other.com">'
+        '<ns0:inner ns1:value="1" /></ns0:namespace>'
+    ) == result
+    assert QualifiedModel.model_validate_xml(result) == model
+
+
+def test_namespace_qualified_names_stream() -> None:
+    # Arrange
+    model = QualifiedModel(
+        inner=QualifiedInnerModel.model_validate({"{http://other.com}value": "1"})
+    )
+    stream = BytesIO()
+
+    # Act
+    model_dump_xml_to_stream(model, stream, by_alias=True)
+
+    # Assert
+    assert (
+        b'<ns0:namespace xmlns:ns0="http://test.com">'
+        b'<ns0:inner xmlns:ns1="http://other.com" ns1:value="1" /></ns0:namespace>'
+    ) == stream.getvalue()
+    assert QualifiedModel.model_validate_xml(stream.getvalue()) == model
@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic_xmlmodel.xmlmodel import XMLModel
 
 
@@ -13,6 +15,11 @@ class ExampleModelLevel1(XMLModel):
     value: int
 
 
+class ExampleModelListLevel1(XMLModel):
+    __xml_name__ = "level1"
+    items: List[ExampleModelLevel1]
+
+
 def test_to_xml_with_indent() -> None:
     # Arrange
     model = ExampleModelLevel1(
@@ -55,3 +62,27 @@ def test_from_xml_with_level() -> None:
     assert model.value == 456
     assert model.level2.name == "test"
     assert model.level2.value == 123
+
+
+def test_to_xml_nested_list_keeps_order() -> None:
+    # Arrange
+    model = ExampleModelListLevel1(
+        items=[
+            ExampleModelLevel1(
+                level2=ExampleModelLevel2(name=f"test{i}", value=i), value=i
+            )
+            for i in range(3)
+        ]
+    )
+
+    # Act
+    result = model.to_xml(include_xml_version=False)
+
+    # Assert
+    assert (
+        "<level1>"
+        '<level1 value="0"><level2 name="test0" value="0" /></level1>'
+        '<level1 value="1"><level2 name="test1" value="1" /></level1>'
+        '<level1 value="2"><level2 name="test2" value="2" /></level1>'
+        "</level1>"
+    ) == result
@@ -116,3 +116,45 @@ def test_xml_content_non_str_type_load() -> None:
 
     # Assert
     assert model.xml_content == 1
+
+
+class XmlContentAnyModel(XMLModel, xml_name="wrapper"):
+    name: str
+
+
+def test_xml_content_model_value() -> None:
+    # Arrange
+    model = XmlContentAnyModel(
+        name="outer", xml_content=XmlContentRenameModel(test="inner")
+    )
+
+    # Act
+    result = model.model_dump_xml()
+
+    # Assert
+    assert (
+        result
+        == '<?xml version="1.0" ?><wrapper name="outer"><testmodel>inner</testmodel></wrapper>'
+    )
+
+
+def test_xml_content_load_with_comment() -> None:
+    # Arrange
+    xml = '<example name="test" value="123">content<!-- comment --> modified</example>'
+
+    # Act
+    model = ExampleModelWithContent.from_xml(xml)
+
+    # Assert
+    assert model.xml_content == "content modified"
+
+
+def test_xml_content_load_with_internal_entity() -> None:
+    # Arrange
+    xml = '<!DOCTYPE example [<!ENTITY e "modified">]><example name="test" value="123">&e;</example>'
+
+    # Act
+    model = ExampleModelWithContent.from_xml(xml)
+
+    # Assert
+    assert model.xml_content == "modified"